@@ -1,5 +1,120 @@
 import numpy as np
-from typing import Dict, List, Tuple
+from math import exp, sin, cos, pi, isqrt
+from typing import Dict, List, NamedTuple, Tuple
+
+try:
+    from numba import guvectorize, njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    def guvectorize(*args, **kwargs):
+        return lambda func: func
+
+    prange = range
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+
+# Time steps per tile in the NumPy fallback; ~10 working rows stay in L2
+_TILE = 8192
+
+
+@njit(fastmath=True, cache=True)
+def _state_point(ti, LAMBDA, GAMMA, BETA, ETA, PHI, delta, pa, pb, terms):
+    """Normalized state at a single time; raw per-prime terms go to `terms`"""
+    # exp(-GAMMA*t) * max(1, t)**-BETA folded into a single exp
+    v = np.exp(-GAMMA * ti - BETA * np.log(max(1.0, ti)))
+    e = ETA * LAMBDA * GAMMA * (1 - np.exp(-delta * ti)) * np.sin(np.pi * PHI * ti)
+    
+    # Normalized prime resonance
+    r_sum = 0.0
+    r_abs = 0.0
+    for j in range(pa.shape[0]):
+        r = np.sin(pa[j] * ti) * np.cos(pb[j] * ti)
+        terms[j] = r
+        r_sum += r
+        r_abs += abs(r)
+    kappa = r_sum / r_abs if r_abs > 0 else 0.0
+    
+    f = LAMBDA * (1 - v) + kappa * (v + e)/2
+    
+    # Normalize; v + f + e == 1 up to round-off, so err is not redistributed
+    total = v + f + e
+    v /= total
+    f /= total
+    e /= total
+    err = 1.0 - (v + f + e)
+    
+    return v, f, e, kappa * (v + f)/2 * np.exp(-GAMMA * ti), err
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _evolve(t, LAMBDA, GAMMA, BETA, ETA, PHI, delta, pa, pb,
+            void, filament, emergence, resonance, error, terms):
+    """Compiled state kernel filling preallocated outputs in parallel over t
+    
+    Time steps are independent, so prange splits them across cores; each
+    step runs a scalar loop over the primes with its math kept in registers.
+    """
+    for i in prange(t.shape[0]):
+        void[i], filament[i], emergence[i], resonance[i], error[i] = \
+            _state_point(t[i], LAMBDA, GAMMA, BETA, ETA, PHI, delta,
+                         pa, pb, terms[:, i])
+
+
+@guvectorize(["void(f8, f8, f8, f8, f8, f8, f8, f8[:], f8[:], "
+              "f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])"],
+             "(),(),(),(),(),(),(),(m),(m)->(),(),(),(),(),(m)",
+             nopython=True, fastmath=True, cache=True)
+def _state_ufunc(ti, LAMBDA, GAMMA, BETA, ETA, PHI, delta, pa, pb,
+                 void, filament, emergence, resonance, error, terms):
+    """State kernel as a NumPy gufunc: broadcasts over scalar or array t"""
+    void[0], filament[0], emergence[0], resonance[0], error[0] = \
+        _state_point(ti, LAMBDA, GAMMA, BETA, ETA, PHI, delta, pa, pb, terms)
+
+
+class State(NamedTuple):
+    """Normalized energy state at a single time"""
+    void: float
+    filament: float
+    emergence: float
+    total: float
+    resonance: float
+    error: float
+
+
+class EvolutionResults:
+    """Column store for an evolution sweep with row-dict access for callers
+    
+    String keys return whole columns, integer indices return one time step
+    as a dict of scalars; its 'prime_contributions' entry is the matching
+    row of the (steps, 5) matrix, ordered like `primes`.
+    """
+    
+    def __init__(self, columns: Dict[str, np.ndarray], primes: List[int]):
+        self.columns = columns
+        self.primes = primes
+    
+    def __len__(self) -> int:
+        return len(self.columns['time'])
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        return {k: v[key] for k, v in self.columns.items()}
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
 
 class NormalizedQDTAnalyzer:
     def __init__(self):
@@ -10,33 +125,72 @@ class NormalizedQDTAnalyzer:
         self.ETA = 0.520       # Emergence
         self.PHI = 1.618033988749  # Golden ratio
         
-        # Energy weights for error redistribution
-        self.w_v = 0.4  # void weight
-        self.w_f = 0.4  # filament weight
-        self.w_e = 0.2  # emergence weight
-        
         # Emergence damping
         self.delta = 0.1  # emergence saturation rate
         
         # Prime resonance cache
         self.primes = self._generate_primes(100)
         
+        # Prime phase constants: resonance term is sin(pa*t) * cos(pb*t)
+        p10 = np.asarray(self.primes[:10], dtype=np.float64)
+        self._pa10 = 2 * np.pi * self.LAMBDA * p10
+        self._pb10 = np.pi * self.BETA * p10
+        # Plain-float copy for the scalar (math module) path
+        self._phases10 = list(zip(self._pa10.tolist(), self._pb10.tolist()))
+        
+        # Scalar state cache keyed by t rounded to 1e-9, oldest entry evicted
+        self._state_cache: Dict[float, State] = {}
+        self._state_cache_size = 4096
+        
     def _generate_primes(self, n: int) -> List[int]:
-        """Generate first n prime numbers"""
-        return [p for p in range(2, n*2) if all(p % i != 0 for i in range(2, int(p**0.5) + 1))]
+        """Generate first n prime numbers with a sieve of Eratosthenes"""
+        # Upper bound on the n-th prime: p_n < n(ln n + ln ln n) for n >= 6
+        N = 15 if n < 6 else int(n * (np.log(n) + np.log(np.log(n)))) + 1
+        sieve = np.ones(N, dtype=bool)
+        sieve[:2] = False
+        for i in range(2, isqrt(N) + 1):
+            if sieve[i]:
+                sieve[i*i::i] = False
+        return np.flatnonzero(sieve)[:n].tolist()
+    
+    def calculate_normalized_state(self, t: float) -> State:
+        """Calculate normalized energy state at time t (memoized)
+        
+        Use `State._asdict()` where string keys are needed.
+        """
+        key = round(float(t), 9)
+        state = self._state_cache.get(key)
+        if state is None:
+            state = self._compute_normalized_state(t)
+            if len(self._state_cache) >= self._state_cache_size:
+                del self._state_cache[next(iter(self._state_cache))]
+            self._state_cache[key] = state
+        return state
     
-    def calculate_normalized_state(self, t: float) -> Dict[str, float]:
+    def _compute_normalized_state(self, t: float) -> State:
         """Calculate normalized energy state at time t"""
+        if NUMBA_AVAILABLE:
+            void_energy, filament_energy, emergence_energy, resonance, error, _ = \
+                _state_ufunc(t, self.LAMBDA, self.GAMMA, self.BETA, self.ETA,
+                             self.PHI, self.delta, self._pa10, self._pb10)
+            return State(float(void_energy),
+                         float(filament_energy),
+                         float(emergence_energy),
+                         float(void_energy + filament_energy + emergence_energy),
+                         float(resonance),
+                         float(error))
+        
+        # Pure-Python fallback on math module scalars
         # Base energy calculations
-        void_energy = np.exp(-self.GAMMA * t) * (1/max(1, t))**self.BETA
+        void_energy = exp(-self.GAMMA * t) * (1/max(1, t))**self.BETA
         
         # Normalized emergence calculation with damping
-        emergence_energy = self.ETA * (1 - np.exp(-self.delta * t)) * \
-                         np.sin(np.pi * t * self.PHI)
+        emergence_energy = self.ETA * (1 - exp(-self.delta * t)) * \
+                         sin(pi * t * self.PHI)
         emergence_energy *= self.LAMBDA * self.GAMMA  # Scale by primary dynamics
         
-        # Calculate prime resonances
-        kappa = self._calculate_prime_resonance(t)
+        # Calculate prime resonances once; reused for the final resonance
+        kappa, _ = self._calculate_prime_resonance(t)
         
         # Filament energy with coupling
         filament_energy = self.LAMBDA * (1 - void_energy) + \
@@ -48,112 +202,252 @@ class NormalizedQDTAnalyzer:
         filament_energy /= total
         emergence_energy /= total
         
-        # Calculate error
+        # After dividing by the total, void + filament + emergence == 1 up to
+        # round-off, so the error is reported but not redistributed
         error = 1.0 - (void_energy + filament_energy + emergence_energy)
         
-        # Redistribute error
-        void_energy += error * self.w_v
-        filament_energy += error * self.w_f
-        emergence_energy += error * self.w_e
-        
         # Calculate final resonance
-        resonance = self._calculate_normalized_resonance(t, 
+        resonance = self._calculate_normalized_resonance(t,
+                                                       kappa,
                                                        void_energy,
                                                        filament_energy)
         
-        return {
-            'void_energy': void_energy,
-            'filament_energy': filament_energy,
-            'emergence_energy': emergence_energy,
-            'total_energy': void_energy + filament_energy + emergence_energy,
-            'resonance': resonance,
-            'error': error
-        }
+        return State(void_energy,
+                     filament_energy,
+                     emergence_energy,
+                     void_energy + filament_energy + emergence_energy,
+                     resonance,
+                     error)
     
-    def _calculate_prime_resonance(self, t: float) -> float:
-        """Calculate normalized prime resonance"""
-        resonances = [
-            np.sin(2 * np.pi * p * self.LAMBDA * t) * 
-            np.cos(np.pi * p * self.BETA * t)
-            for p in self.primes[:10]
-        ]
+    def _calculate_prime_resonance(self, t: float) -> Tuple[float, List[float]]:
+        """Calculate normalized prime resonance and the raw per-prime terms"""
+        raw = [sin(a * t) * cos(b * t) for a, b in self._phases10]
         # Normalize resonances
-        resonances = np.array(resonances)
-        if np.sum(np.abs(resonances)) > 0:
-            resonances /= np.sum(np.abs(resonances))
-        return np.sum(resonances)
+        norm = sum(abs(r) for r in raw)
+        return (sum(raw) / norm if norm > 0 else 0.0), raw
     
     def _calculate_normalized_resonance(self, 
                                       t: float,
+                                      base_resonance: float,
                                       void_energy: float,
                                       filament_energy: float) -> float:
         """Calculate final normalized resonance"""
-        base_resonance = self._calculate_prime_resonance(t)
-        
         # Couple resonance to energy state
         coupled_resonance = base_resonance * \
                           (void_energy + filament_energy)/2
         
-        return coupled_resonance * np.exp(-self.GAMMA * t)
+        return coupled_resonance * exp(-self.GAMMA * t)
+    
+    def _state_vec(self, t: np.ndarray,
+                   dtype: np.dtype = np.float64) -> Dict[str, np.ndarray]:
+        """Calculate normalized energy states over a whole time grid
+        
+        dtype=np.float32 halves the memory traffic of the output columns;
+        conservation then holds to ~1e-7 instead of ~1e-15.
+        """
+        t = np.asarray(t, dtype=dtype)
+        pa = self._pa10.astype(dtype, copy=False)
+        pb = self._pb10.astype(dtype, copy=False)
+        if NUMBA_AVAILABLE:
+            void_energy, filament_energy, emergence_energy, resonance, error = \
+                (np.empty(t.shape[0], dtype) for _ in range(5))
+            R = np.empty((pa.shape[0], t.shape[0]), dtype)
+            _evolve(t, self.LAMBDA, self.GAMMA, self.BETA, self.ETA, self.PHI,
+                    self.delta, pa, pb, void_energy, filament_energy,
+                    emergence_energy, resonance, error, R)
+        elif NUMEXPR_AVAILABLE:
+            void_energy, filament_energy, emergence_energy, resonance, error, R = \
+                self._state_vec_numexpr(t, pa, pb)
+        else:
+            void_energy, filament_energy, emergence_energy, resonance, error, R = \
+                self._state_vec_numpy(t, pa, pb)
+        
+        return {
+            'void_energy': void_energy,
+            'filament_energy': filament_energy,
+            'emergence_energy': emergence_energy,
+            'total_energy': void_energy + filament_energy + emergence_energy,
+            'resonance': resonance,
+            'error': error,
+            'prime_terms': R  # raw per-prime terms, reused for contributions
+        }
+    
+    def _state_vec_numpy(self, t: np.ndarray, pa: np.ndarray,
+                         pb: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """NumPy fallback for the state kernel without Numba or numexpr
+        
+        The grid is processed in tiles of _TILE steps so the per-tile
+        temporaries stay cache resident; they live in one reused workspace.
+        """
+        n = t.shape[0]
+        tile = max(1, min(n, _TILE))
+        void_energy, filament_energy, emergence_energy, resonance, error = \
+            (np.empty(n, t.dtype) for _ in range(5))
+        R = np.empty((pa.shape[0], n), t.dtype)
+        work = (np.empty(tile, t.dtype), np.empty(tile, t.dtype),
+                np.empty((pa.shape[0], tile), t.dtype))
+        
+        for i in range(0, n, tile):
+            s = slice(i, i + tile)
+            self._state_tile(t[s], pa, pb, void_energy[s], filament_energy[s],
+                             emergence_energy[s], resonance[s], error[s], R[:, s],
+                             work)
+        
+        return void_energy, filament_energy, emergence_energy, resonance, error, R
+    
+    def _state_tile(self, t, pa, pb, void, filament, emergence, resonance,
+                    error, R, work) -> None:
+        """Evaluate one tile of the NumPy state kernel into the output views"""
+        k = t.shape[0]
+        tmp, kappa, R_tmp = work[0][:k], work[1][:k], work[2][:, :k]
+        
+        # Branchless void energy: exp(-GAMMA*t - BETA*log(max(t, 1)))
+        np.maximum(t, 1.0, out=tmp)
+        np.log(tmp, out=tmp)
+        tmp *= -self.BETA
+        np.multiply(t, -self.GAMMA, out=void)
+        void += tmp
+        np.exp(void, out=void)
+        
+        # Normalized emergence calculation with damping
+        np.multiply(t, -self.delta, out=emergence)
+        np.exp(emergence, out=emergence)
+        np.subtract(1.0, emergence, out=emergence)
+        emergence *= self.ETA * self.LAMBDA * self.GAMMA
+        np.multiply(t, np.pi * self.PHI, out=tmp)
+        np.sin(tmp, out=tmp)
+        emergence *= tmp
+        
+        # Prime resonances, normalized per time step; norm == 0 only when
+        # every term is 0, so clamping it to `tiny` keeps kappa at 0 there
+        np.multiply(pa[:, None], t, out=R)
+        np.sin(R, out=R)
+        np.multiply(pb[:, None], t, out=R_tmp)
+        np.cos(R_tmp, out=R_tmp)
+        R *= R_tmp
+        np.abs(R, out=R_tmp)
+        R_tmp.sum(0, out=tmp)
+        np.maximum(tmp, np.finfo(t.dtype).tiny, out=tmp)
+        R.sum(0, out=kappa)
+        kappa /= tmp
+        
+        # Filament energy with coupling
+        np.add(void, emergence, out=tmp)
+        tmp *= kappa
+        tmp *= 0.5
+        np.subtract(1.0, void, out=filament)
+        filament *= self.LAMBDA
+        filament += tmp
+        
+        # Normalization by the total
+        np.add(void, filament, out=tmp)
+        tmp += emergence
+        void /= tmp
+        filament /= tmp
+        emergence /= tmp
+        
+        # Residual is round-off only, so it is not redistributed
+        np.add(void, filament, out=error)
+        error += emergence
+        np.subtract(1.0, error, out=error)
+        
+        # Final resonance coupled to energy state
+        np.multiply(t, -self.GAMMA, out=tmp)
+        np.exp(tmp, out=tmp)
+        np.add(void, filament, out=resonance)
+        resonance *= kappa
+        resonance *= tmp
+        resonance *= 0.5
+    
+    def _state_vec_numexpr(self, t: np.ndarray, pa: np.ndarray,
+                           pb: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """State kernel with each elementwise chain fused into one numexpr pass"""
+        # Constants in t's dtype so float32 grids are not upcast
+        c = {k: t.dtype.type(v) for k, v in {
+            'lam': self.LAMBDA,
+            'gam': self.GAMMA,
+            'beta': self.BETA,
+            'delta': self.delta,
+            'emerge': self.ETA * self.LAMBDA * self.GAMMA,
+            'pi_phi': np.pi * self.PHI,
+        }.items()}
+        
+        # Branchless void energy: one exp of a log
+        v = ne.evaluate("exp(-gam*t - beta*log(where(t > 1, t, 1)))",
+                        local_dict={'t': t, **c})
+        e = ne.evaluate("emerge*(1 - exp(-delta*t))*sin(pi_phi*t)",
+                        local_dict={'t': t, **c})
+        
+        # Prime resonances as a (10, N) matrix, normalized per time step
+        R = ne.evaluate("sin(pa*t)*cos(pb*t)",
+                        local_dict={'pa': pa[:, None], 'pb': pb[:, None], 't': t})
+        # numexpr drops the broadcast prime axis on an empty grid
+        R = R.reshape(pa.shape[0], t.shape[0])
+        norm = np.abs(R).sum(0)
+        k = R.sum(0) / np.where(norm > 0, norm, 1)
+        
+        # Filament coupling, then normalization by the total
+        f = ne.evaluate("lam*(1 - v) + k*(v + e)/2",
+                        local_dict={'v': v, 'e': e, 'k': k, **c})
+        total = ne.evaluate("v + f + e")
+        v = ne.evaluate("v/total")
+        f = ne.evaluate("f/total")
+        e = ne.evaluate("e/total")
+        
+        # Residual is round-off only, so it is not redistributed
+        error = ne.evaluate("1 - (v + f + e)")
+        resonance = ne.evaluate("k*(v + f)/2*exp(-gam*t)",
+                                local_dict={'v': v, 'f': f, 'k': k, 't': t, **c})
+        
+        return v, f, e, resonance, error, R
     
     def analyze_evolution(self, t_max: float = 10.0, 
-                         steps: int = 1000) -> List[Dict]:
+                         steps: int = 1000,
+                         dtype: np.dtype = np.float64) -> EvolutionResults:
         """Analyze system evolution with strict conservation"""
-        t_values = np.linspace(0, t_max, steps)
-        results = []
-        
-        for t in t_values:
-            state = self.calculate_normalized_state(t)
-            
-            # Calculate prime contributions
-            prime_contributions = {
-                p: (np.sin(2 * np.pi * p * self.LAMBDA * t) * 
-                    np.cos(np.pi * p * self.BETA * t))
-                for p in self.primes[:5]
-            }
-            
-            # Normalize prime contributions
-            total_contribution = sum(abs(v) for v in prime_contributions.values())
-            if total_contribution > 0:
-                prime_contributions = {
-                    k: v/total_contribution 
-                    for k, v in prime_contributions.items()
-                }
-            
-            results.append({
-                'time': t,
-                **state,
-                'prime_contributions': prime_contributions
-            })
-            
-        return results
-
-# Demonstrate normalized evolution
-analyzer = NormalizedQDTAnalyzer()
-results = analyzer.analyze_evolution()
-
-# Validation
-print("\nNormalized QDT Analysis")
-print("=====================")
-
-print("\nEnergy Conservation Check:")
-for i in [0, -1]:  # Check first and last states
-    t = results[i]['time']
-    print(f"\nTime {t:.2f}:")
-    print(f"Void Energy: {results[i]['void_energy']:.6f}")
-    print(f"Filament Energy: {results[i]['filament_energy']:.6f}")
-    print(f"Emergence Energy: {results[i]['emergence_energy']:.6f}")
-    print(f"Total Energy: {results[i]['total_energy']:.6f}")
-    print(f"Conservation Error: {abs(1 - results[i]['total_energy']):.12f}")
-
-print("\nPrime Resonance Contributions (Final State):")
-for prime, contribution in sorted(
-    results[-1]['prime_contributions'].items(), 
-    key=lambda x: abs(x[1]), 
-    reverse=True
-):
-    print(f"Prime {prime}: {contribution:.6f}")
-
-# Verify conservation throughout evolution
-max_error = max(abs(1 - r['total_energy']) for r in results)
-print(f"\nMaximum Conservation Error: {max_error:.12f}")
+        t_values = np.linspace(0, t_max, steps, dtype=dtype)
+        states = self._state_vec(t_values, dtype)
+        
+        # Prime contributions reuse the resonance terms of the first 5 primes
+        contributions = np.ascontiguousarray(states.pop('prime_terms')[:5].T)
+        total_contribution = np.abs(contributions).sum(axis=1, keepdims=True)
+        contributions /= np.where(total_contribution > 0, total_contribution, 1.0)
+        
+        return EvolutionResults({
+            'time': t_values,
+            **states,
+            'prime_contributions': contributions
+        }, self.primes[:5])
+
+if __name__ == "__main__":
+    # Demonstrate normalized evolution
+    analyzer = NormalizedQDTAnalyzer()
+    results = analyzer.analyze_evolution()
+
+    # Validation
+    print("\nNormalized QDT Analysis")
+    print("=====================")
+
+    print("\nEnergy Conservation Check:")
+    for i in [0, -1]:  # Check first and last states
+        t = results[i]['time']
+        print(f"\nTime {t:.2f}:")
+        print(f"Void Energy: {results[i]['void_energy']:.6f}")
+        print(f"Filament Energy: {results[i]['filament_energy']:.6f}")
+        print(f"Emergence Energy: {results[i]['emergence_energy']:.6f}")
+        print(f"Total Energy: {results[i]['total_energy']:.6f}")
+        print(f"Conservation Error: {abs(results[i]['error']):.12f}")
+
+    print("\nPrime Resonance Contributions (Final State):")
+    final_contributions = dict(zip(results.primes,
+                                   results['prime_contributions'][-1]))
+    for prime, contribution in sorted(
+        final_contributions.items(), 
+        key=lambda x: abs(x[1]), 
+        reverse=True
+    ):
+        print(f"Prime {prime}: {contribution:.6f}")
+
+    # Verify conservation throughout evolution
+    max_error = float(np.abs(1.0 - results['total_energy']).max())
+    print(f"\nMaximum Conservation Error: {max_error:.12f}")
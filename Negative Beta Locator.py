@@ -1,3 +1,5 @@
+import asyncio
+import bisect
 import numpy as np
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
@@ -6,6 +8,12 @@ import time
 import threading
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # Plain Python fallback
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,9 +29,38 @@ class QDTConstants:
     BETA: float = 0.310       # Fractal recursion
     ETA: float = 0.520        # Stabilizing term
 
+# No cache=True: this file is only loadable by path (its name has a space),
+# and numba cannot re-import a cached kernel from such a module
+@njit(fastmath=True)
+def _eff_beta(void_energy, filament_energy, temperature, coupling,
+              time_factor, reference_beta, gamma, eta):
+    """Compiled core of BetaMonitor.calculate_effective_beta"""
+    # Calculate base beta using the standard QDT relationship
+    base_beta = reference_beta * (void_energy / filament_energy) * coupling
+    
+    # Apply time mediation
+    time_mediation = np.exp(-gamma * time_factor) * \
+                     np.sin(2 * np.pi * time_factor * eta)
+    
+    # Calculate effective beta with time mediation
+    effective_beta = base_beta * (1 + 0.2 * time_mediation)
+    
+    # Apply temperature effects (if relevant to the system)
+    if abs(temperature) > 0.1:
+        effective_beta *= 1 - 0.05 * abs(temperature)
+        
+    return effective_beta
+
 class BetaMonitor:
     """Monitor and flag negative beta values in QDT systems"""
     
+    _COLORS = {
+        "EMERGENCY": "#FF0000",  # Red
+        "CRITICAL": "#FF7700",   # Orange
+        "ALERT": "#FFFF00",      # Yellow
+        "NORMAL": "#00FF00",     # Green
+    }
+    
     def __init__(self, 
                  reference_beta: float = 0.310, 
                  alert_threshold: float = 0.05,
@@ -42,13 +79,22 @@ class BetaMonitor:
         self.critical_threshold = critical_threshold
         self.emergency_threshold = emergency_threshold
         
+        # Status per bisect index into the ascending thresholds
+        self._status_labels = ("EMERGENCY", "CRITICAL", "ALERT", "NORMAL")
+        
         self.current_beta = reference_beta
-        self.beta_history = []
+        # Fixed-size ring buffer of recent beta values; its raw layout is not
+        # chronological, so get_beta_history() is the public accessor
+        self.history_size = 1000
+        self._beta_history = np.empty(self.history_size, dtype=np.float64)
+        self._history_idx = 0
+        self._history_count = 0
         self.alert_status = "NORMAL"
         self.alert_callbacks = []
         
         self.monitor_active = False
         self.monitor_thread = None
+        self.monitor_handle = None
         
     def register_alert_callback(self, callback: Callable[[str, float], None]):
         """Register a callback function to be called when alert status changes.
@@ -70,28 +116,15 @@ class BetaMonitor:
         Returns:
             Effective beta value
         """
-        # Extract key metrics from system state
-        void_energy = system_state.get('void_energy', 0.5)
-        filament_energy = system_state.get('filament_energy', 0.5)
-        temperature = system_state.get('temperature', 0)
-        coupling = system_state.get('coupling', QDTConstants.LAMBDA)
-        
-        # Calculate base beta using the standard QDT relationship
-        base_beta = self.reference_beta * (void_energy / filament_energy) * coupling
-        
-        # Apply time mediation
-        time_mediation = np.exp(-QDTConstants.GAMMA * time_factor) * \
-                         np.sin(2 * np.pi * time_factor * QDTConstants.ETA)
-        
-        # Calculate effective beta with time mediation
-        effective_beta = base_beta * (1 + 0.2 * time_mediation)
-        
-        # Apply temperature effects (if relevant to the system)
-        if abs(temperature) > 0.1:
-            temp_factor = 1 - 0.05 * abs(temperature)
-            effective_beta *= temp_factor
-            
-        return effective_beta
+        # Extract key metrics from system state once, then run the compiled kernel
+        return _eff_beta(float(system_state.get('void_energy', 0.5)),
+                         float(system_state.get('filament_energy', 0.5)),
+                         float(system_state.get('temperature', 0)),
+                         float(system_state.get('coupling', QDTConstants.LAMBDA)),
+                         float(time_factor),
+                         self.reference_beta,
+                         QDTConstants.GAMMA,
+                         QDTConstants.ETA)
         
     def update_beta(self, new_beta: float):
         """Update current beta value and check for triggers.
@@ -100,64 +133,101 @@ class BetaMonitor:
             new_beta: New beta value to evaluate
         """
         self.current_beta = new_beta
-        self.beta_history.append(new_beta)
         
-        # Trim history if too long
-        if len(self.beta_history) > 1000:
-            self.beta_history = self.beta_history[-1000:]
+        # O(1) ring-buffer write; the oldest value is overwritten when full
+        self._beta_history[self._history_idx] = new_beta
+        self._history_idx = (self._history_idx + 1) % self.history_size
+        self._history_count = min(self._history_count + 1, self.history_size)
             
         # Check for triggers
         previous_status = self.alert_status
         
-        if new_beta <= self.emergency_threshold:
-            self.alert_status = "EMERGENCY"
-        elif new_beta <= self.critical_threshold:
-            self.alert_status = "CRITICAL"
-        elif new_beta <= self.alert_threshold:
-            self.alert_status = "ALERT"
-        else:
-            self.alert_status = "NORMAL"
+        # Index of the first threshold >= new_beta (3 if none); read from the
+        # public attributes each time so reassigning a threshold takes effect
+        thresholds = (self.emergency_threshold, self.critical_threshold, self.alert_threshold)
+        self.alert_status = self._status_labels[bisect.bisect_left(thresholds, new_beta)]
             
         # If status changed, notify callbacks
         if previous_status != self.alert_status:
             self._notify_callbacks()
     
+    def get_beta_history(self) -> np.ndarray:
+        """Return recorded beta values in chronological order (oldest first)"""
+        if self._history_count < self.history_size:
+            return self._beta_history[:self._history_count].copy()
+        return np.concatenate((self._beta_history[self._history_idx:],
+                               self._beta_history[:self._history_idx]))
+    
     def _notify_callbacks(self):
         """Notify all registered callbacks about status change"""
+        # Read the attributes once rather than on every callback
+        status, beta = self.alert_status, self.current_beta
         for callback in self.alert_callbacks:
             try:
-                callback(self.alert_status, self.current_beta)
+                callback(status, beta)
             except Exception as e:
                 logging.error(f"Error in callback: {e}")
     
+    def tick(self, system_state: Dict[str, float], time_factor: float) -> float:
+        """Run one monitoring step on a system state snapshot.
+        
+        Hosts with their own event loop can call this directly instead of
+        running a monitor thread.
+        
+        Args:
+            system_state: Current system state
+            time_factor: Current time factor
+            
+        Returns:
+            Effective beta value for this step
+        """
+        effective_beta = self.calculate_effective_beta(system_state, time_factor)
+        self.update_beta(effective_beta)
+        
+        # Log if not normal
+        if self.alert_status != "NORMAL":
+            logging.warning(
+                f"Beta alert: {self.alert_status}, β={self.current_beta:.4f}"
+            )
+        return effective_beta
+    
     def start_monitoring(self, 
                         state_provider: Callable[[], Dict[str, float]], 
-                        interval: float = 1.0):
-        """Start continuous monitoring thread.
+                        interval: float = 1.0,
+                        loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Start continuous monitoring.
         
         Args:
             state_provider: Function that returns current system state
             interval: Monitoring interval in seconds
+            loop: Optional asyncio event loop; ticks are then scheduled on it
+                with call_later and no monitor thread is started
         """
         if self.monitor_active:
             return
             
         self.monitor_active = True
         
+        if loop is not None:
+            def scheduled_tick(time_factor):
+                if not self.monitor_active:
+                    return
+                try:
+                    self.tick(state_provider(), time_factor)
+                    time_factor += interval
+                except Exception as e:
+                    logging.error(f"Error in monitoring loop: {e}")
+                self.monitor_handle = loop.call_later(interval, scheduled_tick, time_factor)
+            
+            loop.call_soon_threadsafe(scheduled_tick, 0)
+            logging.info("Beta monitoring started")
+            return
+        
         def monitor_loop():
             time_factor = 0
             while self.monitor_active:
                 try:
-                    system_state = state_provider()
-                    effective_beta = self.calculate_effective_beta(system_state, time_factor)
-                    self.update_beta(effective_beta)
-                    
-                    # Log if not normal
-                    if self.alert_status != "NORMAL":
-                        logging.warning(
-                            f"Beta alert: {self.alert_status}, β={self.current_beta:.4f}"
-                        )
-                    
+                    self.tick(state_provider(), time_factor)
                     time.sleep(interval)
                     time_factor += interval
                 except Exception as e:
@@ -170,22 +240,18 @@ class BetaMonitor:
         logging.info("Beta monitoring started")
     
     def stop_monitoring(self):
-        """Stop the monitoring thread"""
+        """Stop the monitoring thread or scheduled ticks"""
         self.monitor_active = False
+        if self.monitor_handle:
+            self.monitor_handle.cancel()
+            self.monitor_handle = None
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
         logging.info("Beta monitoring stopped")
     
     def get_status_color(self) -> str:
         """Get color code for current status"""
-        if self.alert_status == "EMERGENCY":
-            return "#FF0000"  # Red
-        elif self.alert_status == "CRITICAL":
-            return "#FF7700"  # Orange
-        elif self.alert_status == "ALERT":
-            return "#FFFF00"  # Yellow
-        else:
-            return "#00FF00"  # Green
+        return self._COLORS.get(self.alert_status, "#00FF00")
     
     def visualize_beta_history(self, window_size: int = 100):
         """Visualize beta history with alert thresholds.
@@ -193,7 +259,7 @@ class BetaMonitor:
         Args:
             window_size: Number of recent points to display
         """
-        history = self.beta_history[-window_size:] if len(self.beta_history) > window_size else self.beta_history
+        history = self.get_beta_history()[-window_size:]
         
         plt.figure(figsize=(12, 6))
         
@@ -368,13 +434,21 @@ def run_beta_monitoring_demo():
     
     print("\nRunning simulation with gradually decreasing beta...\n")
     
+    # First half does not depend on monitor feedback: gradual decrease with
+    # some noise, generated for all steps at once
+    decline_steps = time_steps[:simulation_steps // 2]
+    decline_betas = (monitor.reference_beta
+                     - 0.01 * (decline_steps / (simulation_steps // 4))
+                     + 0.01 * np.sin(decline_steps / 5))
+    
+    # Recovery noise table, indexed per step in the feedback loop
+    sin3 = np.sin(time_steps / 3)
+    
     # Run simulation
     for step in range(simulation_steps):
-        # In first half, gradually decrease beta
+        # In first half, replay the precomputed decrease
         if step < simulation_steps // 2:
-            # Gradual decrease with some noise
-            decrease_rate = 0.01 * (step / (simulation_steps // 4))
-            beta = monitor.reference_beta - decrease_rate + 0.01 * np.sin(step/5)
+            beta = float(decline_betas[step])
         else:
             # In second half, recover with corrective actions
             if monitor.alert_status != "NORMAL":
@@ -383,7 +457,7 @@ def run_beta_monitoring_demo():
                 beta += correction * 0.1
             
             # Add some noise
-            beta += 0.01 * np.sin(step/3)
+            beta += 0.01 * float(sin3[step])
         
         # Update the monitor
         monitor.update_beta(beta)
@@ -411,11 +485,10 @@ def run_beta_monitoring_demo():
     plt.axhline(y=0, color='black', linestyle=':', alpha=0.5, label='Zero Line')
     
     # Highlight alert regions
-    alert_mask = np.array([v <= monitor.alert_threshold and v > monitor.critical_threshold 
-                         for v in beta_values])
-    critical_mask = np.array([v <= monitor.critical_threshold and v > monitor.emergency_threshold 
-                            for v in beta_values])
-    emergency_mask = np.array([v <= monitor.emergency_threshold for v in beta_values])
+    bv = np.asarray(beta_values)
+    alert_mask = (bv <= monitor.alert_threshold) & (bv > monitor.critical_threshold)
+    critical_mask = (bv <= monitor.critical_threshold) & (bv > monitor.emergency_threshold)
+    emergency_mask = bv <= monitor.emergency_threshold
     
     if np.any(alert_mask):
         plt.fill_between(time_steps, monitor.alert_threshold, monitor.critical_threshold,
@@ -426,7 +499,7 @@ def run_beta_monitoring_demo():
                         where=critical_mask, color='orange', alpha=0.3, label='Critical Zone')
     
     if np.any(emergency_mask):
-        plt.fill_between(time_steps, monitor.emergency_threshold, min(beta_values),
+        plt.fill_between(time_steps, monitor.emergency_threshold, bv.min(),
                         where=emergency_mask, color='red', alpha=0.3, label='Emergency Zone')
     
     # Add markers for corrective actions
@@ -435,23 +508,31 @@ def run_beta_monitoring_demo():
     correction_colors = []
     correction_sizes = []
     
-    for i, action in enumerate(corrector.corrective_actions_history):
-        for step, beta in enumerate(beta_values):
-            if abs(beta - action['beta_value']) < 0.001:
-                correction_steps.append(step)
-                correction_values.append(beta)
-                
-                if action['action'] == 'EMERGENCY_RESET':
-                    correction_colors.append('red')
-                    correction_sizes.append(150)
-                elif action['action'] == 'STRONG_CORRECTION':
-                    correction_colors.append('orange')
-                    correction_sizes.append(100)
-                else:
-                    correction_colors.append('yellow')
-                    correction_sizes.append(80)
-                
-                break
+    # Each action is marked at the first step whose beta lies within 0.001 of
+    # the action's beta, found for all actions at once
+    actions = corrector.corrective_actions_history
+    if actions:
+        action_betas = np.fromiter((a['beta_value'] for a in actions),
+                                   dtype=np.float64, count=len(actions))
+        close = np.abs(bv[None, :] - action_betas[:, None]) < 0.001
+        matched = close.any(axis=1)
+        first_steps = close.argmax(axis=1)
+        
+        for action, found, step in zip(actions, matched, first_steps):
+            if not found:
+                continue
+            correction_steps.append(int(step))
+            correction_values.append(beta_values[step])
+            
+            if action['action'] == 'EMERGENCY_RESET':
+                correction_colors.append('red')
+                correction_sizes.append(150)
+            elif action['action'] == 'STRONG_CORRECTION':
+                correction_colors.append('orange')
+                correction_sizes.append(100)
+            else:
+                correction_colors.append('yellow')
+                correction_sizes.append(80)
     
     if correction_steps:
         plt.scatter(correction_steps, correction_values, c=correction_colors, s=correction_sizes,
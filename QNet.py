@@ -15,26 +15,44 @@ class Q:
     EPS = 1e-10
 
 class QState:
-    """Quantum state with auto-stabilization"""
-    def __init__(self, amps: torch.Tensor):
-        self.amps = amps.to(torch.complex64)
-        norm = torch.norm(self.amps)
-        if norm < Q.EPS:
-            self.amps = torch.zeros_like(self.amps)
-            self.amps[0] = 1.0
-        else:
-            self.amps = self.amps / norm
+    """Quantum state with auto-stabilization; leading dims are batch dims.
+    
+    Amplitudes are kept as paired real and imaginary float32 tensors so
+    evolution runs as plain real matmuls.
+    """
+    def __init__(self, re: torch.Tensor, im: torch.Tensor):
+        re, im = re.to(torch.float32), im.to(torch.float32)
+        norm = torch.sqrt((re * re + im * im).sum(-1, keepdim=True))
+        vanished = norm < Q.EPS
+        scale = 1.0 / norm.clamp_min(Q.EPS)
+        ground = torch.zeros_like(re)
+        ground[..., 0] = 1.0
+        self.re = torch.where(vanished, ground, re * scale)
+        self.im = torch.where(vanished, torch.zeros_like(im), im * scale)
         
-        try:
-            rho = torch.outer(self.amps, self.amps.conj())
-            rho = rho / (torch.trace(rho) + Q.EPS)
-            self.purity = torch.trace(rho @ rho).real.item()
-            self.coherence = torch.norm(rho - torch.diag(torch.diag(rho))).real.item()
-            eigenvals = torch.clamp(torch.linalg.eigvals(rho).real, Q.EPS, 1)
-            eigenvals = eigenvals / (eigenvals.sum() + Q.EPS)
-            self.entropy = -torch.sum(eigenvals * torch.log2(eigenvals + Q.EPS)).item()
-        except:
-            self.purity, self.coherence, self.entropy = 0.5, 0.1, 1.0
+        # A normalized pure state has purity 1 and zero entropy, and the
+        # off-diagonal Frobenius norm of |a><a| is sqrt(1 - sum |a_i|^4)
+        p = self.re * self.re + self.im * self.im
+        self.purity = p.new_ones(p.shape[:-1])
+        self.entropy = p.new_zeros(p.shape[:-1])
+        # Basis states read exactly 0; the sqrt argument is clamped separately
+        # so its gradient stays finite where the coherence vanishes
+        c2 = (1.0 - (p * p).sum(-1)).clamp_min(0.0)
+        self.coherence = torch.where(c2 > 0, torch.sqrt(c2.clamp_min(Q.EPS ** 2)), c2)
+    
+    @property
+    def amps(self) -> torch.Tensor:
+        return torch.complex(self.re, self.im)
+
+@torch.jit.script
+def encode_amplitudes(x: torch.Tensor, weight: torch.Tensor, bias: torch.Tensor,
+                      phase: torch.Tensor, qdim: int) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Linear encode, tanh, real/imag split and phase rotation as one scripted graph"""
+    enc = torch.tanh(F.linear(x, weight, bias))
+    real = enc[..., :qdim]
+    imag = enc[..., qdim:]
+    cos, sin = torch.cos(phase * 0.1), torch.sin(phase * 0.1)
+    return real * cos - imag * sin, real * sin + imag * cos
 
 class QHam:
     """Quantum Hamiltonian"""
@@ -45,30 +63,52 @@ class QHam:
         self.Z = torch.tensor([[1,0],[0,-1]], dtype=torch.complex64)
         self.I = torch.eye(2, dtype=torch.complex64)
         self.disorder = torch.randn(n) * 0.1
+        self._h = self.disorder.tolist()
+        
+        # Pauli operators on each qubit are fixed, so build them once
+        self.X_ops = torch.stack([self._single_op(i, self.X) for i in range(n)])
+        self.Z_ops = torch.stack([self._single_op(i, self.Z) for i in range(n)])
+        self.X_sum = self.X_ops.sum(0)
+        self.Z_field = (self.disorder[:, None, None] * self.Z_ops).sum(0)
     
     def _single_op(self, i: int, pauli: torch.Tensor) -> torch.Tensor:
-        op = torch.tensor([[1.0]], dtype=torch.complex64)
-        for j in range(self.n):
-            op = torch.kron(op, pauli if j == i else self.I)
-        return op
+        # I_left (x) pauli (x) I_right as one einsum over row/column index triples
+        left = torch.eye(2 ** i, dtype=torch.complex64)
+        right = torch.eye(2 ** (self.n - i - 1), dtype=torch.complex64)
+        return torch.einsum('ab,ij,cd->aicbjd', left, pauli, right).reshape(self.dim, self.dim)
     
     def H(self, t: float) -> torch.Tensor:
-        H = torch.zeros(self.dim, self.dim, dtype=torch.complex64)
         drive = 0.5 + 0.2 * math.sin(Q.PHI * t)
-        
-        for i in range(self.n):
-            H += drive * self._single_op(i, self.X)
-            H += self.disorder[i] * self._single_op(i, self.Z)
-        
-        return H
+        return drive * self.X_sum + self.Z_field
+    
+    def _exp_H(self, t: float, dt: float) -> Tuple[torch.Tensor, torch.Tensor]:
+        # H = sum_i (drive X_i + h_i Z_i) is a sum of commuting single-qubit
+        # terms, so exp(-iH*tau) is exactly the Kronecker product of the 2x2
+        # rotations cos(w*tau) I - i sin(w*tau)/w (drive X + h_i Z), w = |(drive, h_i)|
+        # At most 8x8, so it is assembled on the host from scalars
+        tau = dt * 0.01
+        drive = 0.5 + 0.2 * math.sin(Q.PHI * t)
+        exp_H = np.ones((1, 1), dtype=np.complex128)
+        for h in self._h:
+            w = math.hypot(drive, h)  # drive >= 0.3, so w > 0
+            c, s = math.cos(w * tau), math.sin(w * tau) / w
+            u = np.array([[complex(c, -s * h), -1j * s * drive],
+                          [-1j * s * drive, complex(c, s * h)]])
+            # Kronecker product as a broadcast outer product; np.kron is far
+            # slower on matrices this small
+            d = 2 * exp_H.shape[0]
+            exp_H = (exp_H[:, None, :, None] * u[None, :, None, :]).reshape(d, d)
+        # Real and imaginary parts, transposed for row-vector amplitudes
+        return (torch.from_numpy(exp_H.real.T.astype(np.float32)),
+                torch.from_numpy(exp_H.imag.T.astype(np.float32)))
     
     def evolve(self, state: QState, t: float, dt: float = 0.01) -> QState:
         try:
-            H = self.H(t)
-            # Stable series expansion
-            exp_H = torch.eye(self.dim, dtype=torch.complex64) - 1j * H * dt * 0.01
-            new_amps = exp_H @ state.amps
-            return QState(new_amps)
+            A, B = self._exp_H(t, dt)
+            # (A + iB)(re + i*im) as four real matmuls
+            new_re = state.re @ A - state.im @ B
+            new_im = state.re @ B + state.im @ A
+            return QState(new_re, new_im)
         except:
             return state
 
@@ -84,50 +124,50 @@ class QLayer(nn.Module):
         self.decode = nn.Linear(self.qdim, dim)
         self.qham = QHam(self.qubits)
         self.phase = nn.Parameter(torch.zeros(self.qdim))
-        self.register_buffer('t', torch.tensor(0.0))
+        self.register_buffer('bias', torch.full((self.qdim,), 0.05 / math.sqrt(self.qdim)),
+                             persistent=False)
+        # Layer time stays a host float; it is saved via get/set_extra_state
+        self._t_float = 0.0
     
-    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, Dict]:
-        # Handle batch vs single input
-        if x.dim() == 1:
-            return self._forward_single(x)
-        else:
-            # Batch processing
-            outputs, all_metrics = [], []
-            for i in range(x.shape[0]):
-                out, metrics = self._forward_single(x[i])
-                outputs.append(out)
-                all_metrics.append(metrics)
-            
-            # Average metrics
-            avg_metrics = {k: np.mean([m[k] for m in all_metrics]) for k in all_metrics[0]}
-            return torch.stack(outputs), avg_metrics
+    def get_extra_state(self) -> Dict:
+        return {'t': self._t_float}
     
-    def _forward_single(self, x: torch.Tensor) -> Tuple[torch.Tensor, Dict]:
-        # Encode
-        enc = torch.tanh(self.encode(x))
-        real = enc[:self.qdim]
-        imag = enc[self.qdim:]
-        
-        # Apply phase (element-wise)
-        phase_factor = torch.exp(1j * self.phase * 0.1)
-        amps = (real + 1j * imag) * phase_factor
+    def set_extra_state(self, state: Dict):
+        self._t_float = float(state['t'])
+    
+    def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
+                              missing_keys, unexpected_keys, error_msgs):
+        # Older checkpoints stored layer time as a 't' buffer; map it onto the
+        # extra state so strict loading still accepts them
+        legacy_t = state_dict.pop(prefix + 't', None)
+        if legacy_t is not None:
+            state_dict.setdefault(prefix + '_extra_state', {'t': float(legacy_t)})
+        super()._load_from_state_dict(state_dict, prefix, local_metadata, strict,
+                                      missing_keys, unexpected_keys, error_msgs)
+    
+    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, Dict]:
+        # Encode and apply phase; any leading dims of x evolve together as one batch
+        re, im = encode_amplitudes(x, self.encode.weight, self.encode.bias,
+                                   self.phase, self.qdim)
         
         # Add superposition bias
-        bias = torch.ones(self.qdim, dtype=torch.complex64) * (0.05 / math.sqrt(self.qdim))
-        amps = amps + bias
+        re = re + self.bias
         
-        # Evolve
-        state = QState(amps)
+        # Evolve; the whole batch shares one time step
+        state = QState(re, im)
         for _ in range(2):  # Reduced steps
-            state = self.qham.evolve(state, self.t.item())
-            self.t += 0.01
+            state = self.qham.evolve(state, self._t_float)
+            self._t_float += 0.01
         
-        # Measure
-        out = self.decode(torch.abs(state.amps))
+        # Measure; metrics stay 0-d tensors in the graph, with no host sync here
+        # |a| with the sqrt argument clamped: hypot's gradient is 0/0 at a zero
+        # amplitude, while this one is 0 there, as with complex abs
+        mag = torch.sqrt((state.re * state.re + state.im * state.im).clamp_min(Q.EPS ** 2))
+        out = self.decode(mag)
         metrics = {
-            'purity': state.purity,
-            'coherence': state.coherence, 
-            'entropy': state.entropy
+            'purity': state.purity.mean(),
+            'coherence': state.coherence.mean(), 
+            'entropy': state.entropy.mean()
         }
         
         return out, metrics
@@ -160,8 +200,8 @@ class QNet(nn.Module):
         avg_metrics = {}
         if metrics and all(isinstance(m, dict) for m in metrics):
             for k in metrics[0]:
-                values = [m[k] for m in metrics if k in m and not (math.isnan(m[k]) or math.isinf(m[k]))]
-                avg_metrics[k] = np.mean(values) if values else 0.5
+                values = torch.stack([torch.as_tensor(m[k], dtype=torch.float32) for m in metrics])
+                avg_metrics[k] = torch.nan_to_num(values, nan=0.5, posinf=0.5, neginf=0.5).mean()
         
         return {
             'output': out, 
@@ -171,7 +211,13 @@ class QNet(nn.Module):
 
 class QTrainer:
     """Compact quantum trainer"""
-    def __init__(self, model: QNet, lr: float = 1e-3):
+    def __init__(self, model: QNet, lr: float = 1e-3, compile_model: bool = False):
+        # Opt-in: Inductor can fuse the elementwise quantum-classical mixing in
+        # QNet.forward, but the host-side layer clock, the operator cache and
+        # the .item() in forward cause guard failures and graph breaks
+        self.compiled = compile_model and hasattr(torch, 'compile')
+        if self.compiled:
+            model = torch.compile(model, mode="reduce-overhead")
         self.model = model
         self.opt = torch.optim.AdamW(model.parameters(), lr=lr, weight_decay=1e-5)
         self.loss_fn = nn.MSELoss()
@@ -183,9 +229,10 @@ class QTrainer:
             out = self.model(x)
             loss = self.loss_fn(out['output'], y)
             
-            # Quantum regularization
+            # Quantum regularization; metrics are tensors, so qreg is part of
+            # the autograd graph and lives on the model's device
             m = out['metrics']
-            qreg = torch.tensor(0.0)
+            qreg = loss.new_zeros(())
             if m:
                 coherence = m.get('coherence', 0.5)
                 purity = m.get('purity', 0.5) 
@@ -201,9 +248,12 @@ class QTrainer:
                 'loss': total.item(), 
                 'classical': loss.item(), 
                 'quantum': qreg.item() if isinstance(qreg, torch.Tensor) else qreg,
-                **m
+                **{k: float(v) for k, v in m.items()}
             }
-        except Exception as e:
+        except Exception:
+            # Compile and Inductor failures must surface, not pass as a no-op step
+            if self.compiled:
+                raise
             # Fallback training step
             return {
                 'loss': 1.0, 
@@ -224,7 +274,6 @@ class QCNN(nn.Module):
         super().__init__()
         self.conv = nn.Conv2d(3, 16, 3, padding=1)
         self.q = QLayer(16, 2)
-        self.pool = nn.AdaptiveAvgPool2d(1)
         self.fc = nn.Linear(16, classes)
     
     def forward(self, x):
@@ -232,8 +281,8 @@ class QCNN(nn.Module):
         b, c, h, w = x.shape
         x_flat = x.view(b, c, -1).mean(-1)
         x_q, _ = self.q(x_flat)
-        x = x_q.view(b, c, 1, 1).expand(-1, -1, h, w)
-        return self.fc(self.pool(x).flatten(1))
+        # x_q is already the pooled (b, c) feature vector
+        return self.fc(x_q)
 
 class QTransformer(nn.Module):
     """Quantum Transformer"""
@@ -16,13 +16,17 @@ class QDTConstants:
     KAPPA_0 = 1.0   # Base time mediation
 
 
-# Define QDT-inspired activation
-def qdt_activation(x, t, constants):
+# Define QDT time-mediation gain (elementwise in t)
+def qdt_kappa(t, constants):
     damping = torch.exp(-constants.GAMMA * t)
     oscillation = torch.sin(2 * np.pi * t * constants.ALPHA)
     modulation = 1 + constants.BETA * torch.cos(constants.PHI * t)
-    kappa = constants.KAPPA_0 * damping * oscillation * modulation
-    return torch.tanh(kappa * x)
+    return constants.KAPPA_0 * damping * oscillation * modulation
+
+
+# Define QDT-inspired activation
+def qdt_activation(x, t, constants):
+    return torch.tanh(qdt_kappa(t, constants) * x)
 
 
 # Define dynamic QDT-inspired neural network
@@ -32,17 +36,28 @@ class DynamicQDTNN(nn.Module):
         self.constants = QDTConstants()
         self.time_steps = time_steps
         self.time = torch.arange(0, time_steps).float()
+        # The time grid is fixed, so the activation gain per step is too
+        self.kappa = qdt_kappa(self.time, self.constants)
 
         self.hidden_layer = nn.Linear(input_size, hidden_size)
         self.output_layer = nn.Linear(hidden_size, output_size)
 
     def forward(self, x, step):
-        t = self.time[step % self.time_steps]
+        kappa = self.kappa[step % self.time_steps]
         x = self.hidden_layer(x)
-        x = qdt_activation(x, t, self.constants)
+        x = torch.tanh(kappa * x)
         x = self.output_layer(x)
         return x
 
+    def forward_all_steps(self, x, num_steps):
+        # Mean output over steps 0..num_steps-1: the hidden layer runs once and
+        # the activation is broadcast over a (T, 1, 1) time axis
+        kappa = self.kappa[torch.arange(num_steps) % self.time_steps]
+        h = self.hidden_layer(x)
+        activated = torch.tanh(kappa[:, None, None] * h[None])
+        # The output layer is affine, so it commutes with the mean over time
+        return self.output_layer(activated.mean(dim=0))
+
 
 # Generate synthetic data for training
 def generate_synthetic_data(num_samples=1000, input_size=1):
@@ -76,8 +91,7 @@ def train_qdt_network(model, dataloader, num_epochs=50, learning_rate=0.01):
 def visualize_results(model, x, y, time_steps):
     model.eval()
     with torch.no_grad():
-        y_pred = [model(x, t) for t in range(time_steps)]
-    y_pred = torch.stack(y_pred).mean(dim=0).squeeze()
+        y_pred = model.forward_all_steps(x, time_steps).squeeze()
 
     plt.figure(figsize=(10, 6))
     plt.plot(x.numpy(), y.numpy(), label="True Data", alpha=0.7)
@@ -1,6 +1,6 @@
 ```python
 import numpy as np
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq
 import matplotlib.pyplot as plt
 
 class BlackHoleQDT:
@@ -11,19 +11,31 @@ class BlackHoleQDT:
         self.T0 = self.G * self.mass * 2e30 / self.c**3
         self.omega0 = self.c**3 / (self.G * self.mass * 2e30)
         self.primes = self._generate_primes(n_primes)
+        # Per-prime factors of tau: p^(-t/T0) = exp(t * -log(p)/T0)
+        self._neg_logp_over_T0 = -np.log(self.primes) / self.T0
+        self._omega0_over_p = self.omega0 / self.primes
         
     def _generate_primes(self, n):
-        primes = []
-        num = 2
-        while len(primes) < n:
-            if all(num % prime != 0 for prime in primes):
-                primes.append(num)
-            num += 1
-        return np.array(primes)
+        # Sieve of Eratosthenes up to an estimate of the n-th prime,
+        # doubling the limit in the rare case it falls short
+        limit = int(max(n, 2) * np.log(max(n, 2)) * 1.3 + 10)
+        while True:
+            sieve = np.ones(limit, dtype=bool)
+            sieve[:2] = False
+            for i in range(2, int(limit**0.5) + 1):
+                if sieve[i]:
+                    sieve[i*i::i] = False
+            primes = np.nonzero(sieve)[0]
+            if len(primes) >= n:
+                return primes[:n]
+            limit *= 2
     
     def tau(self, t):
-        return sum(np.power(p, -t/self.T0) * np.cos(self.omega0*t/p) 
-                  for p in self.primes)
+        # Broadcast primes over the shape of t and sum along the prime axis
+        t = np.asarray(t, dtype=float)
+        shape = (-1,) + (1,) * t.ndim
+        decay = np.exp(self._neg_logp_over_T0.reshape(shape) * t)
+        return np.sum(decay * np.cos(self._omega0_over_p.reshape(shape) * t), axis=0)
     
     def quantum_tunneling(self, tau_val, alpha=0.5):
         return np.exp(-alpha * np.abs(tau_val))
@@ -39,13 +51,17 @@ class BlackHoleQDT:
     
     def simulate(self, t_max, n_points=1000):
         t = np.linspace(0, t_max, n_points)
-        tau_vals = np.array([self.tau(ti) for ti in t])
-        e_total, qt, gf = zip(*[self.total_energy(ti) for ti in t])
+        tau_vals = self.tau(t)
+        qt = self.quantum_tunneling(tau_vals)
+        gf = self.gravitational_funneling(tau_vals)
+        e_total = qt + gf
         
         # QPO analysis
         dt = t[1] - t[0]
-        freqs = fftfreq(len(t), dt)
-        tau_fft = np.abs(fft(tau_vals))
+        # tau is real, so only the non-negative half of the spectrum is needed
+        n_half = len(t) // 2
+        freqs = rfftfreq(len(t), dt)
+        tau_fft = np.abs(rfft(tau_vals))
         
         return {
             't': t,
@@ -53,8 +69,8 @@ class BlackHoleQDT:
             'e_total': e_total,
             'qt': qt,
             'gf': gf,
-            'freqs': freqs[1:len(freqs)//2],
-            'power': tau_fft[1:len(freqs)//2]
+            'freqs': freqs[1:n_half],
+            'power': tau_fft[1:n_half]
         }
     
     def analyze(self, results):
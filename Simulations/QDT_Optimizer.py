@@ -1,7 +1,16 @@
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Fall back to the einsum forward pass
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 @dataclass
 class QDTConstants:
     """Core QDT constants based on established values."""
@@ -13,62 +22,118 @@ class QDTConstants:
     ETA: float = 0.520              # Stabilizing term
 
 
+@njit(cache=True, fastmath=True)
+def _forward_kernel(W1, W2, W3, x):
+    """Both tanh layers and the scalar output in one compiled call"""
+    hidden_1 = np.tanh(W1 @ x)
+    hidden_2 = np.tanh(W2 @ hidden_1)
+    return np.dot(W3[0], hidden_2), hidden_1, hidden_2
+
+
 class QDTOptimizer:
     """Baseline QDT Optimizer with energy conservation and scale coupling."""
     
-    def __init__(self, input_dim: int):
+    def __init__(self, input_dim: int, seed: Optional[int] = None, dtype=np.float32):
         self.input_dim = input_dim
         self.constants = QDTConstants()
+        self._rng = np.random.default_rng(seed)
+        # A toy MLP with a scalar energy output gains nothing from float64
+        self.dtype = np.dtype(dtype)
+        
+        # Weight matrices are redrawn on every pass; refill the same buffers
+        hidden_size = max(32, input_dim * 2)
+        self._W1 = np.empty((hidden_size, input_dim), dtype=self.dtype)
+        self._W2 = np.empty((hidden_size, hidden_size), dtype=self.dtype)
+        self._W3 = np.empty((1, hidden_size), dtype=self.dtype)
+        
+        # Tokenization couplings per (length, dtype); they do not depend on params
+        self._couplings = {}
+        
+        # Contraction paths depend only on the layer shapes, so search them once
+        self._hidden_path = np.einsum_path('ij,j->i', np.empty((hidden_size, input_dim)),
+                                           np.empty(input_dim), optimize='optimal')[0]
+        self._square_path = np.einsum_path('ij,j->i', np.empty((hidden_size, hidden_size)),
+                                           np.empty(hidden_size), optimize='optimal')[0]
+        self._output_path = np.einsum_path('ij,j->', np.empty((1, hidden_size)),
+                                           np.empty(hidden_size), optimize='optimal')[0]
         
     def _initialize_parameters(self) -> np.ndarray:
         """Initialize parameters with QDT-based constraints."""
-        params = np.random.uniform(0, self.constants.PHI, self.input_dim)
+        params = self._rng.random(self.input_dim, dtype=self.dtype)
+        params *= self.constants.PHI  # Uniform on [0, PHI)
         params *= self.constants.LAMBDA  # Apply coupling constraint
         return params
     
     def _tokenize_parameters(self, params: np.ndarray) -> np.ndarray:
         """Enhanced parameter tokenization with recursive coupling."""
-        merges = [
-            (self.constants.ALPHA, self.constants.BETA),
-            (self.constants.BETA, self.constants.GAMMA),
-            (self.constants.GAMMA, self.constants.LAMBDA)
-        ]
-        
-        tokenized = np.zeros_like(params)
-        for i in range(len(params)):
-            merge_pair = merges[i % len(merges)]
-            coupling = merge_pair[0] + merge_pair[1] * np.exp(-self.constants.ETA * i)
-            tokenized[i] = params[i] * coupling
-            
-        return tokenized
+        key = (len(params), params.dtype)
+        if key not in self._couplings:
+            c = self.constants
+            i = np.arange(len(params))
+            base = np.array([c.ALPHA, c.BETA, c.GAMMA])[i % 3]
+            decay = np.array([c.BETA, c.GAMMA, c.LAMBDA])[i % 3]
+            self._couplings[key] = (base + decay * np.exp(-c.ETA * i)).astype(params.dtype)
+        return params * self._couplings[key]
     
     def _forward_pass(self, tokenized_params: np.ndarray, target_energy: float) -> Tuple[float, Dict]:
-        """Forward pass with energy conservation."""
+        """Forward pass with energy conservation.
+
+        Returns summary statistics of the activations rather than the vectors
+        themselves. LAMBDA and BETA are folded into layers 2 and 3, so they
+        are reapplied to the raw tanh outputs here.
+        """
         weights = self._initialize_weights()
-        hidden_1 = np.tanh(weights['layer1'] @ tokenized_params) * self.constants.LAMBDA
-        hidden_2 = np.tanh(weights['layer2'] @ hidden_1) * self.constants.BETA
-        achieved_energy = float(weights['layer3'] @ hidden_2)
-        damping = np.exp(-self.constants.GAMMA * abs(target_energy - achieved_energy))
+        if NUMBA_AVAILABLE:
+            energy, hidden_1, hidden_2 = _forward_kernel(
+                weights['layer1'], weights['layer2'], weights['layer3'],
+                np.ascontiguousarray(tokenized_params, dtype=self.dtype))
+            achieved_energy = float(energy)
+        else:
+            hidden_1 = np.einsum('ij,j->i', weights['layer1'], tokenized_params, optimize=self._hidden_path)
+            hidden_1 = np.tanh(hidden_1, out=hidden_1)
+            hidden_2 = np.einsum('ij,j->i', weights['layer2'], hidden_1, optimize=self._square_path)
+            hidden_2 = np.tanh(hidden_2, out=hidden_2)
+            # Contract the single output row straight to a scalar
+            achieved_energy = float(np.einsum('ij,j->', weights['layer3'], hidden_2,
+                                              optimize=self._output_path))
+        c = self.constants
+        damping = np.exp(-c.GAMMA * abs(target_energy - achieved_energy))
         achieved_energy *= damping
-        return achieved_energy, {'hidden_1': hidden_1, 'hidden_2': hidden_2, 'damping': damping}
+        return achieved_energy, {
+            'hidden_1_mean': float(np.mean(hidden_1)) * c.LAMBDA,
+            'hidden_2_mean': float(np.mean(hidden_2)) * c.BETA,
+            'hidden_1_std': float(np.std(hidden_1)) * c.LAMBDA,
+            'hidden_2_std': float(np.std(hidden_2)) * c.BETA,
+            # The pairwise sum is linear in hidden_1, so LAMBDA factors out
+            'hidden_1_spread': self._pairwise_spread(hidden_1) * c.LAMBDA,
+            'damping': float(damping)
+        }
+    
+    @staticmethod
+    def _pairwise_spread(h: np.ndarray) -> float:
+        """Sum of |h_i - h_j| over all pairs i < j."""
+        # With h sorted ascending, the k-th value is added k times and
+        # subtracted n - 1 - k times
+        h = np.sort(h)
+        n = len(h)
+        return float(np.dot(2 * np.arange(n, dtype=h.dtype) - n + 1, h))
     
     def _initialize_weights(self) -> Dict[str, np.ndarray]:
         """Initialize weight matrices with QDT constraints."""
-        hidden_size = max(32, self.input_dim * 2)
-        return {
-            'layer1': np.random.normal(0, 1/np.sqrt(self.input_dim), (hidden_size, self.input_dim)),
-            'layer2': np.random.normal(0, 1/np.sqrt(hidden_size), (hidden_size, hidden_size)),
-            'layer3': np.random.normal(0, 1/np.sqrt(hidden_size), (1, hidden_size))
-        }
+        hidden_size = self._W2.shape[0]
+        c = self.constants
+        # Each layer absorbs the scale of the activation it consumes
+        for weights, scale in ((self._W1, 1/np.sqrt(self.input_dim)),
+                               (self._W2, c.LAMBDA/np.sqrt(hidden_size)),
+                               (self._W3, c.BETA/np.sqrt(hidden_size))):
+            self._rng.standard_normal(dtype=self.dtype, out=weights)
+            weights *= scale
+        return {'layer1': self._W1, 'layer2': self._W2, 'layer3': self._W3}
     
     def _compute_stability_score(self, achieved_energy: float, target_energy: float, activations: Dict) -> float:
         """Compute stability score with multi-scale feedback."""
         energy_diff = abs(target_energy - achieved_energy) / abs(target_energy)
-        scale_penalty = 0.0
-        for i in range(len(activations['hidden_1'])):
-            for j in range(i + 1, len(activations['hidden_1'])):
-                scale_penalty += abs(activations['hidden_1'][i] - activations['hidden_1'][j])
-        scale_penalty *= self.constants.BETA
+        scale_penalty = activations['hidden_1_spread'] * self.constants.BETA
         stability = (1 - energy_diff) * self.constants.LAMBDA - scale_penalty * (1 - self.constants.LAMBDA)
         return float(np.clip(stability, 0, 1))
     
@@ -83,12 +148,10 @@ class QDTOptimizer:
             "achieved_energy": achieved_energy,
             "energy_difference": abs(achieved_energy - target_energy),
             "stability_score": stability_score,
-            "parameters": tokenized_params.tolist(),
-            "coupling_strength": float(activations['damping']),
+            "parameters": tokenized_params,
+            "coupling_strength": activations['damping'],
             "scale_distribution": {
-                "hidden_1_mean": float(np.mean(activations['hidden_1'])),
-                "hidden_2_mean": float(np.mean(activations['hidden_2'])),
-                "hidden_1_std": float(np.std(activations['hidden_1'])),
-                "hidden_2_std": float(np.std(activations['hidden_2']))
+                key: activations[key]
+                for key in ("hidden_1_mean", "hidden_2_mean", "hidden_1_std", "hidden_2_std")
             }
         }
\ No newline at end of file
@@ -1,110 +1,136 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useCallback, useRef } from 'react';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 
+// Real NOAA data (would be fetched real-time in production)
+const observedData = {
+  KJFK: {
+    base: {
+      temp: 22.4,     // Current temperature (°C)
+      pressure: 1013.2, // Current pressure (hPa)
+      humidity: 0.65,   // Current humidity
+      windSpeed: 12     // Current wind speed (km/h)
+    },
+    hourly: [
+      { hour: 0, temp: 22.4, pressure: 1013.2, humidity: 0.65, windSpeed: 12 },
+      { hour: 1, temp: 22.2, pressure: 1013.0, humidity: 0.66, windSpeed: 11 },
+      { hour: 2, temp: 21.9, pressure: 1012.9, humidity: 0.67, windSpeed: 10 },
+      { hour: 3, temp: 21.7, pressure: 1012.8, humidity: 0.68, windSpeed: 10 },
+      { hour: 4, temp: 21.5, pressure: 1012.7, humidity: 0.69, windSpeed: 9 },
+      { hour: 5, temp: 21.3, pressure: 1012.8, humidity: 0.70, windSpeed: 9 },
+      { hour: 6, temp: 21.4, pressure: 1012.9, humidity: 0.69, windSpeed: 10 }
+    ]
+  }
+};
+
+// QDT constants
+const constants = {
+  lambda: 0.867,  // Scale coupling
+  gamma: 0.4497, // Energy transfer
+  beta: 0.310,   // Pattern stability
+  eta: 0.520     // Time mediation
+};
+
 const WeatherValidation = () => {
   const [timeRange, setTimeRange] = useState(24);
   const [currentStation, setCurrentStation] = useState('KJFK');
 
-  // Real NOAA data (would be fetched real-time in production)
-  const observedData = {
-    KJFK: {
-      base: {
-        temp: 22.4,     // Current temperature (°C)
-        pressure: 1013.2, // Current pressure (hPa)
-        humidity: 0.65,   // Current humidity
-        windSpeed: 12     // Current wind speed (km/h)
-      },
-      hourly: [
-        { hour: 0, temp: 22.4, pressure: 1013.2, humidity: 0.65, windSpeed: 12 },
-        { hour: 1, temp: 22.2, pressure: 1013.0, humidity: 0.66, windSpeed: 11 },
-        { hour: 2, temp: 21.9, pressure: 1012.9, humidity: 0.67, windSpeed: 10 },
-        { hour: 3, temp: 21.7, pressure: 1012.8, humidity: 0.68, windSpeed: 10 },
-        { hour: 4, temp: 21.5, pressure: 1012.7, humidity: 0.69, windSpeed: 9 },
-        { hour: 5, temp: 21.3, pressure: 1012.8, humidity: 0.70, windSpeed: 9 },
-        { hour: 6, temp: 21.4, pressure: 1012.9, humidity: 0.69, windSpeed: 10 }
-      ]
-    }
-  };
-
-  // QDT constants
-  const constants = {
-    lambda: 0.867,  // Scale coupling
-    gamma: 0.4497, // Energy transfer
-    beta: 0.310,   // Pattern stability
-    eta: 0.520     // Time mediation
-  };
-
-  // Calculate energy redistribution across scales
-  const calculateEnergyRedistribution = (t, baseConditions) => {
-    // Top-down atmospheric effects
-    const topDown = {
-      pressureSystem: Math.exp(-constants.gamma * t / 48),
-      jetstream: Math.sin(2 * Math.PI * t / 24 * constants.eta),
-      airMass: Math.exp(-constants.beta * t / 72)
-    };
+  // Validation rows per station, extended as the time range grows
+  const resultsCache = useRef({});
 
-    // Middle-level regional dynamics
-    const regional = {
-      frontSystem: Math.sin(2 * Math.PI * t / 12),
-      advection: Math.cos(2 * Math.PI * t / 24),
-      moisture: Math.exp(-constants.gamma * t / 36)
-    };
+  // Calculate energy redistribution across scales for hours start..end-1
+  const calculateEnergyRedistribution = useCallback((start, end, baseConditions) => {
+    const hours = end - start;
+    const temperature = new Float64Array(hours);
+    const pressure = new Float64Array(hours);
+    const humidity = new Float64Array(hours);
+    const windSpeed = new Float64Array(hours);
+    const energyRedistribution = new Float64Array(hours);
 
-    // Bottom-up local conditions
-    const local = {
-      surfaceHeating: Math.sin(2 * Math.PI * t / 24),
-      terrain: Math.exp(-constants.beta * t / 12),
-      evaporation: Math.cos(2 * Math.PI * t / 12)
-    };
+    // Decays advance by a constant ratio per hour, so each is one multiply
+    const pressureDecay = Math.exp(-constants.gamma / 48);
+    const airMassDecay = Math.exp(-constants.beta / 72);
+    const terrainDecay = Math.exp(-constants.beta / 12);
+    let pressureSystem = Math.exp(-constants.gamma * start / 48);
+    let airMass = Math.exp(-constants.beta * start / 72);
+    let terrain = Math.exp(-constants.beta * start / 12);
 
-    // Energy redistribution factor
-    const redistributionFactor = constants.lambda * (
-      topDown.pressureSystem +
-      regional.frontSystem * constants.beta +
-      local.terrain * constants.gamma
-    );
+    const dayAngle = 2 * Math.PI / 24;
+    for (let i = 0; i < hours; i++) {
+      const t = start + i;
+      // Diurnal phase; the 12-hour terms follow from the double-angle identities
+      const daySin = Math.sin(dayAngle * t);
+      const dayCos = Math.cos(dayAngle * t);
 
-    return {
-      temperature: baseConditions.temp +
-        2 * redistributionFactor * local.surfaceHeating +
-        1.5 * regional.advection +
-        topDown.airMass,
-      pressure: baseConditions.pressure *
-        (1 + redistributionFactor * 0.02),
-      humidity: baseConditions.humidity *
-        (1 + local.evaporation * constants.beta),
-      windSpeed: baseConditions.windSpeed *
-        (1 + topDown.jetstream * constants.lambda),
-      energyRedistribution: redistributionFactor
-    };
-  };
+      // Top-down atmospheric effects
+      const jetstream = Math.sin(dayAngle * t * constants.eta);
+
+      // Middle-level regional dynamics
+      const frontSystem = 2 * daySin * dayCos;
+      const advection = dayCos;
+
+      // Bottom-up local conditions
+      const surfaceHeating = daySin;
+      const evaporation = 1 - 2 * daySin * daySin;
+
+      // Energy redistribution factor
+      const redistributionFactor = constants.lambda * (
+        pressureSystem +
+        frontSystem * constants.beta +
+        terrain * constants.gamma
+      );
+
+      temperature[i] = baseConditions.temp +
+        2 * redistributionFactor * surfaceHeating +
+        1.5 * advection +
+        airMass;
+      pressure[i] = baseConditions.pressure *
+        (1 + redistributionFactor * 0.02);
+      humidity[i] = baseConditions.humidity *
+        (1 + evaporation * constants.beta);
+      windSpeed[i] = baseConditions.windSpeed *
+        (1 + jetstream * constants.lambda);
+      energyRedistribution[i] = redistributionFactor;
+
+      pressureSystem *= pressureDecay;
+      airMass *= airMassDecay;
+      terrain *= terrainDecay;
+    }
+
+    return { temperature, pressure, humidity, windSpeed, energyRedistribution };
+  }, []);
 
   // Generate predictions and compare with observed data
   const validationResults = useMemo(() => {
-    const results = [];
     const station = observedData[currentStation];
-    
-    for (let hour = 0; hour < timeRange; hour++) {
-      const prediction = calculateEnergyRedistribution(hour, station.base);
-      const observed = station.hourly[hour] || null;
-      
-      if (observed) {
-        const tempError = Math.abs(prediction.temperature - observed.temp);
+    // Hours past the last observation have nothing to validate against
+    const hours = Math.min(timeRange, station.hourly.length);
+
+    // Earlier hours do not depend on the range, so only new ones are computed
+    if (!resultsCache.current[currentStation]) resultsCache.current[currentStation] = [];
+    const results = resultsCache.current[currentStation];
+    if (results.length < hours) {
+      const start = results.length;
+      const prediction = calculateEnergyRedistribution(start, hours, station.base);
+
+      for (let hour = start; hour < hours; hour++) {
+        const observed = station.hourly[hour];
+        const predictedTemp = prediction.temperature[hour - start];
+        const tempError = Math.abs(predictedTemp - observed.temp);
         const tempAccuracy = 100 * (1 - tempError / observed.temp);
-        
+
         results.push({
           hour,
-          predictedTemp: prediction.temperature,
+          predictedTemp,
           observedTemp: observed.temp,
           accuracy: tempAccuracy,
           error: tempError,
-          energyRedistribution: prediction.energyRedistribution
+          energyRedistribution: prediction.energyRedistribution[hour - start]
         });
       }
     }
     
-    return results;
-  }, [timeRange, currentStation]);
+    return results.slice(0, hours);
+  }, [timeRange, currentStation, calculateEnergyRedistribution]);
 
   const accuracyMetrics = useMemo(() => {
     if (validationResults.length === 0) return null;
@@ -1,11 +1,64 @@
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # NumPy fallbacks are used instead
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    import pyfftw
+    PYFFTW_AVAILABLE = True
+except ImportError:  # np.fft is used instead
+    PYFFTW_AVAILABLE = False
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:  # analysis stays on the CPU
+    CUPY_AVAILABLE = False
+
+
+@njit(fastmath=True, cache=True)
+def _information_flow_1d(psi, out):
+    """np.gradient of -|psi|^2 log(|psi|^2 + 1e-10) in a single pass over the grid"""
+    n = psi.shape[0]
+    d = psi[0].real**2 + psi[0].imag**2
+    s_prev = -d * np.log(d + 1e-10)
+    d = psi[1].real**2 + psi[1].imag**2
+    s_cur = -d * np.log(d + 1e-10)
+    # One-sided differences at the edges, central differences inside
+    out[0] = s_cur - s_prev
+    for i in range(1, n - 1):
+        d = psi[i + 1].real**2 + psi[i + 1].imag**2
+        s_next = -d * np.log(d + 1e-10)
+        out[i] = 0.5 * (s_next - s_prev)
+        s_prev, s_cur = s_cur, s_next
+    out[n - 1] = s_cur - s_prev
+    return out
+
+
+@njit(fastmath=True, cache=True)
+def _entropy_sum(psi):
+    """-sum |psi|^2 log(|psi|^2 + 1e-10) without materialising the density"""
+    S = 0.0
+    for i in range(psi.shape[0]):
+        d = psi[i].real**2 + psi[i].imag**2
+        S -= d * np.log(d + 1e-10)
+    return S
+
+
 class AdvancedQDT(ComprehensiveQDT):
     """
     Extended QDT framework with advanced physics models and analysis tools.
     Inherits from ComprehensiveQDT for base functionality.
     """
     
-    def __init__(self, dimensions=1, grid_points=1000, bounds=(-10, 10)):
+    def __init__(self, dimensions=1, grid_points=1000, bounds=(-10, 10), use_gpu=False):
         super().__init__(dimensions, grid_points, bounds)
+        # Run the scale analysis on the GPU through CuPy when requested
+        self.use_gpu = use_gpu and CUPY_AVAILABLE
         self.setup_advanced_parameters()
         
     def setup_advanced_parameters(self):
@@ -14,11 +67,36 @@ class AdvancedQDT(ComprehensiveQDT):
         self.chi = 0.1  # Nonlinear interaction strength
         self.omega = 1.0  # Oscillator frequency
         self.T = 1.0  # Temperature
+        self._harmonic_cache = None
+        
+        # Morse potential parameters
+        self.morse_D = 1.0  # Dissociation energy
+        self.morse_a = 1.0  # Controls width of potential well
+        self._morse_cache = None
         
         # Information flow parameters
         self.info_coupling = 0.05
         self.entropy_history = []
         
+        # Wavelet spectra per scale set; they depend only on the grid
+        self._wavelet_fft_cache = {}
+        
+        # pyFFTW plan for the grid FFT as ((shape, dtype), plan), built on first use
+        self._fft_plan = None
+        
+        # Thermal noise pool, sized for the (shape, dtype) of psi on first use
+        self._rng = np.random.default_rng()
+        self._noise_key = None
+        
+        # Squared and plain radius on the fixed mesh, shared by the potentials
+        mesh_stack = np.stack(self.mesh, axis=0)
+        self._r_sq = np.einsum('d...,d...->...', mesh_stack, mesh_stack)
+        self._r = np.sqrt(self._r_sq)
+        
+        # Box walls: any coordinate beyond 90% of its half-width
+        self._box_mask = np.logical_or.reduce([
+            np.abs(x) > 0.9 * (g[-1] - g[0])/2 for x, g in zip(self.mesh, self.grid)])
+        
         # Extended controls
         self.setup_advanced_controls()
         
@@ -68,34 +146,47 @@ class AdvancedQDT(ComprehensiveQDT):
         
     def harmonic_potential(self):
         """Quantum harmonic oscillator potential."""
-        if self.dims == 1:
-            return 0.5 * self.m * (self.omega * self.mesh[0])**2
-        return 0.5 * self.m * self.omega**2 * sum(x**2 for x in self.mesh)
+        # Fixed mesh: only rebuild when omega or m change
+        key = (self.omega, self.m)
+        if self._harmonic_cache is None or self._harmonic_cache[0] != key:
+            self._harmonic_cache = (key, 0.5 * self.m * self.omega**2 * self._r_sq)
+        return self._harmonic_cache[1]
         
     def box_potential(self):
         """Infinite potential well."""
         V = np.zeros_like(self.psi)
-        for i, x in enumerate(self.mesh):
-            V[np.abs(x) > 0.9 * (self.grid[i][-1] - self.grid[i][0])/2] = 1e6
+        V[self._box_mask] = 1e6
         return V
         
     def morse_potential(self):
         """Morse potential for molecular binding."""
-        D = 1.0  # Dissociation energy
-        a = 1.0  # Controls width of potential well
-        if self.dims == 1:
-            r = np.abs(self.mesh[0])
-        else:
-            r = np.sqrt(sum(x**2 for x in self.mesh))
-        return D * (1 - np.exp(-a*r))**2
+        # Fixed mesh: only rebuild when D or a change
+        key = (self.morse_D, self.morse_a)
+        if self._morse_cache is None or self._morse_cache[0] != key:
+            self._morse_cache = (key, self.morse_D * (1 - np.exp(-self.morse_a*self._r))**2)
+        return self._morse_cache[1]
         
     def nonlinear_potential(self):
         """Nonlinear interaction potential."""
         return self.chi * np.abs(self.psi)**2
         
     def thermal_potential(self):
-        """Temperature-dependent potential."""
-        return -1j * self.gamma * self.T * np.random.normal(0, 1, self.psi.shape)
+        """Temperature-dependent potential (the returned buffer is reused by the next call)."""
+        key = (self.psi.shape, self.psi.dtype)
+        if self._noise_key != key:
+            # Noise is drawn in float32 blocks of up to 64 grids (~4 MB) and
+            # refilled in place once every sample in the block is used
+            pool_size = int(np.clip(2**20 // max(self.psi.size, 1), 1, 64))
+            self._noise_pool = np.empty((pool_size,) + self.psi.shape, dtype=np.float32)
+            self._noise_idx = pool_size
+            self._thermal_buf = np.empty(self.psi.shape, dtype=complex)
+            self._noise_key = key
+        if self._noise_idx == len(self._noise_pool):
+            self._rng.standard_normal(dtype=np.float32, out=self._noise_pool)
+            self._noise_idx = 0
+        noise = self._noise_pool[self._noise_idx]
+        self._noise_idx += 1
+        return np.multiply(noise, -1j * self.gamma * self.T, out=self._thermal_buf)
         
     def resource_potential(self):
         """Enhanced resource coupling with information flow."""
@@ -104,28 +195,34 @@ class AdvancedQDT(ComprehensiveQDT):
                
     def calculate_information_flow(self):
         """Calculate information flow based on entropy gradients."""
+        if NUMBA_AVAILABLE and self.dims == 1 and self.psi.size > 1:
+            return _information_flow_1d(self.psi, np.empty(self.psi.shape))
         density = np.abs(self.psi)**2
         entropy = -density * np.log(density + 1e-10)
         flow = np.gradient(entropy)
         if self.dims == 1:
-            return flow[0]
-        return sum(f for f in flow)
+            return flow
+        return np.add.reduce(flow)
         
     def analyze_scales(self):
         """
         Enhanced multi-scale analysis using wavelets and Fourier transforms.
         """
+        xp = cp if self.use_gpu else np
+        
         # Wavelet analysis
         scales = np.arange(1, 32)
-        wavelet_coeffs = self.wavelet_transform(scales)
+        wavelet_coeffs = self.wavelet_transform(scales, xp)
         
         # Fourier analysis
-        fourier_coeffs = np.fft.fftn(self.psi)
+        fourier_coeffs = self.fftn(self.psi)
         
-        # Scale-dependent energy
-        E_scale = np.zeros_like(scales, dtype=float)
-        for i, scale in enumerate(scales):
-            E_scale[i] = np.sum(np.abs(wavelet_coeffs[i])**2)
+        # Scale-dependent energy, all scales in one reduction
+        E_scale = (wavelet_coeffs.real**2 + wavelet_coeffs.imag**2).sum(axis=1)
+        
+        # Results are handed back as host arrays
+        if xp is not np:
+            wavelet_coeffs, E_scale = cp.asnumpy(wavelet_coeffs), cp.asnumpy(E_scale)
             
         return {
             'scales': scales,
@@ -134,27 +231,58 @@ class AdvancedQDT(ComprehensiveQDT):
             'energy_scale': E_scale
         }
         
-    def wavelet_transform(self, scales):
-        """Perform continuous wavelet transform."""
-        coeffs = np.zeros((len(scales), len(self.x)), dtype=complex)
-        
-        for i, scale in enumerate(scales):
-            # Mother wavelet (Morlet)
-            wavelet = np.exp(-(self.x**2)/(2*scale**2)) * \
-                     np.exp(2j*np.pi*self.x/scale)
-            coeffs[i] = np.convolve(self.psi, wavelet, mode='same')
-            
-        return coeffs
+    def fftn(self, psi):
+        """N-D FFT over the grid through a persistent FFTW plan when available."""
+        if self.use_gpu:
+            return cp.asnumpy(cp.fft.fftn(cp.asarray(psi)))
+        if not PYFFTW_AVAILABLE:
+            return np.fft.fftn(psi)
+        key = (psi.shape, psi.dtype)
+        if self._fft_plan is None or self._fft_plan[0] != key:
+            # FFTW_MEASURE overwrites the buffers while planning, so plan first.
+            # Single precision stays single, as with np.fft
+            dtype = np.result_type(psi.dtype, np.complex64)
+            in_buf = pyfftw.empty_aligned(psi.shape, dtype=dtype)
+            out_buf = pyfftw.empty_aligned(psi.shape, dtype=dtype)
+            self._fft_plan = (key, pyfftw.FFTW(in_buf, out_buf, axes=tuple(range(psi.ndim)),
+                                               flags=('FFTW_MEASURE',)))
+        plan = self._fft_plan[1]
+        plan.input_array[...] = psi
+        # Copy out so later transforms do not overwrite returned coefficients
+        return plan().copy()
+        
+    def wavelet_transform(self, scales, xp=np):
+        """Perform continuous wavelet transform with xp (NumPy or CuPy)."""
+        n = len(self.x)
+        # Zero-pad to a power of two >= 2n - 1 so the circular product equals
+        # the linear convolution np.convolve computes
+        n_fft = 1 << (2 * n - 2).bit_length()
+        
+        key = (tuple(np.asarray(scales).tolist()), n, xp.__name__)
+        if key not in self._wavelet_fft_cache:
+            # Mother wavelet (Morlet), one row per scale; spectra stay on xp's device
+            s = np.asarray(scales, dtype=float)[:, None]
+            wavelets = np.exp(-(self.x**2)/(2*s**2)) * np.exp(2j*np.pi*self.x/s)
+            self._wavelet_fft_cache[key] = xp.fft.fft(xp.asarray(wavelets), n_fft, axis=1)
+        
+        psi = xp.asarray(self.psi)
+        full = xp.fft.ifft(xp.fft.fft(psi, n_fft) * self._wavelet_fft_cache[key], axis=1)
+        # Centered window of the full convolution, matching mode='same'
+        start = (n - 1) // 2
+        return full[:, start:start + n]
         
     def calculate_entropy(self):
         """Calculate various entropy measures."""
-        density = np.abs(self.psi)**2
-        
         # von Neumann entropy
-        S_vN = -np.sum(density * np.log(density + 1e-10))
+        if NUMBA_AVAILABLE:
+            S_vN = _entropy_sum(self.psi.ravel())
+        else:
+            density = (self.psi.real**2 + self.psi.imag**2).ravel()
+            S_vN = -np.einsum('i,i->', density, np.log(density + 1e-10))
         
         # Resource entropy
-        S_res = -np.sum(self.resources * np.log(np.abs(self.resources) + 1e-10))
+        resources = self.resources.ravel()
+        S_res = -np.einsum('i,i->', resources, np.log(np.abs(resources) + 1e-10))
         
         # Information entropy
         S_info = self.calculate_information_entropy()